@@ -10,3 +10,7 @@ router = APIRouter(
 @router.post("/", response_model=legalQuery_schema.LegalQueryOutput, status_code=status.HTTP_201_CREATED)
 async def query(query: legalQuery_schema.LegalQueryBase):
     return legalQuery_crud.query(query)
+
+@router.post("/batch", response_model=legalQuery_schema.LegalQueryBatchOutput, status_code=status.HTTP_201_CREATED)
+async def query_batch(batch: legalQuery_schema.LegalQueryBatch):
+    return await legalQuery_crud.query_batch(batch)
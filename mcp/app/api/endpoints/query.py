@@ -11,6 +11,10 @@ router = APIRouter(
 async def query(query: query_schema.QueryBase):
     return query_crud.query(query)
 
+@router.post("/batch", response_model=query_schema.QueryBatchOutput, status_code=status.HTTP_201_CREATED)
+async def query_batch(batch: query_schema.QueryBatch):
+    return await query_crud.query_batch(batch)
+
 @router.post("/test")
 async def test_query():
     return {"message": "Test query endpoint"}
\ No newline at end of file
@@ -1,20 +1,41 @@
 import os
+from functools import lru_cache
+from types import SimpleNamespace
 from dotenv import load_dotenv
 from blockfrost import ApiUrls
 
-# Load environment variables from .env file
-load_dotenv()
 
-# OpenAI Configuration
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+@lru_cache(maxsize=1)
+def _load() -> SimpleNamespace:
+    """Load the .env file once and snapshot the environment settings."""
+    # Load environment variables from .env file
+    load_dotenv()
 
-# Blockfrost API Configuration
-BLOCKFROST_PROJECT_ID  = os.getenv("BLOCKFROST_PROJECT_ID")
-BLOCKFROST_BASE_URL = os.getenv("BLOCKFROST_BASE_URL", ApiUrls.preview.value)
+    return SimpleNamespace(
+        # OpenAI Configuration
+        OPENAI_API_KEY=os.environ.get("OPENAI_API_KEY"),
+
+        # Blockfrost API Configuration
+        BLOCKFROST_PROJECT_ID=os.environ.get("BLOCKFROST_PROJECT_ID"),
+        BLOCKFROST_BASE_URL=os.environ.get("BLOCKFROST_BASE_URL", ApiUrls.preview.value),
+
+        # ChromaDB Configuration
+        CHROMA_DB_PATH=os.environ.get("CHROMA_DB_PATH", "./chroma_data"),
+    )
+
+
+def __getattr__(name: str):
+    # Environment-backed settings are resolved lazily from the cached snapshot
+    env = _load()
+    if hasattr(env, name):
+        return getattr(env, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# ChromaDB Configuration
-CHROMA_DB_PATH = os.getenv("CHROMA_DB_PATH", "./chroma_data")
 
 # LLM Configuration
 MODELS = ['text-embedding-3-small', 'gpt-3.5-turbo', 'gpt-4o-mini']
-TEMPERATURE = 0.1
\ No newline at end of file
+TEMPERATURE = 0.1
+
+# API Configuration
+# A batch passes the rate limiter as one request, so keep it small
+MAX_BATCH_QUERIES = 5
@@ -1,3 +1,5 @@
+import asyncio
+from starlette.concurrency import run_in_threadpool
 from fastapi import HTTPException, status
 from workflow.kickoff import run_legal_agent
 from app.schemas import legalQuery_schema
@@ -11,4 +13,18 @@ def query(query: legalQuery_schema.LegalQueryBase):
             lang=query.lang or "en"
         )
     else:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No answer found")
\ No newline at end of file
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No answer found")
+
+def batch_item(outcome) -> legalQuery_schema.LegalQueryBatchItem:
+    # A failed query is reported in its own slot instead of failing the batch
+    if isinstance(outcome, HTTPException):
+        return legalQuery_schema.LegalQueryBatchItem(status_code=outcome.status_code, detail=outcome.detail)
+    if isinstance(outcome, BaseException):
+        return legalQuery_schema.LegalQueryBatchItem(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(outcome))
+    return legalQuery_schema.LegalQueryBatchItem(status_code=status.HTTP_201_CREATED, result=outcome)
+
+async def query_batch(batch: legalQuery_schema.LegalQueryBatch):
+    # Run the blocking agent calls side by side in the threadpool
+    outcomes = await asyncio.gather(*[run_in_threadpool(query, item) for item in batch.queries],
+                                    return_exceptions=True)
+    return legalQuery_schema.LegalQueryBatchOutput(results=[batch_item(outcome) for outcome in outcomes])
@@ -1,3 +1,5 @@
+import asyncio
+from starlette.concurrency import run_in_threadpool
 from fastapi import HTTPException, status
 from workflow.kickoff import run_cardano_agent
 from app.schemas import query_schema
@@ -11,4 +13,18 @@ def query(query: query_schema.QueryBase):
             lang=query.lang or "en"
         )
     else:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No answer found")
\ No newline at end of file
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No answer found")
+
+def batch_item(outcome) -> query_schema.QueryBatchItem:
+    # A failed query is reported in its own slot instead of failing the batch
+    if isinstance(outcome, HTTPException):
+        return query_schema.QueryBatchItem(status_code=outcome.status_code, detail=outcome.detail)
+    if isinstance(outcome, BaseException):
+        return query_schema.QueryBatchItem(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(outcome))
+    return query_schema.QueryBatchItem(status_code=status.HTTP_201_CREATED, result=outcome)
+
+async def query_batch(batch: query_schema.QueryBatch):
+    # Run the blocking agent calls side by side in the threadpool
+    outcomes = await asyncio.gather(*[run_in_threadpool(query, item) for item in batch.queries],
+                                    return_exceptions=True)
+    return query_schema.QueryBatchOutput(results=[batch_item(outcome) for outcome in outcomes])
@@ -2,12 +2,21 @@ from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
 from app.api.endpoints import query, legal_query, training
+from workflow.agents import cardano_agent
+from contextlib import asynccontextmanager
 from typing import Dict
 from collections import defaultdict
 import time
 import asyncio
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the Cardano agent up front so a bad configuration fails startup
+    # and the first query doesn't pay for it
+    cardano_agent.agent
+    yield
+
+app = FastAPI(lifespan=lifespan)
 
 origins = [
     "http://localhost",
@@ -1,6 +1,7 @@
-from typing import Optional
-from pydantic import BaseModel, Field, ConfigDict
+from typing import List, Optional
+from pydantic import BaseModel, Field, ConfigDict, field_validator
 from datetime import datetime
+from app.core.config import MAX_BATCH_QUERIES
 
 class QueryBase(BaseModel):
     thread_id: int
@@ -26,4 +27,24 @@ class QueryOutput(BaseModel):
     answer: str
     thread_id: int
     lang: Optional[str] = "en"
-    date_created: datetime = Field(default_factory=datetime.now)
\ No newline at end of file
+    date_created: datetime = Field(default_factory=datetime.now)
+
+class QueryBatch(BaseModel):
+    queries: List[QueryBase] = Field(..., min_length=1, max_length=MAX_BATCH_QUERIES)
+
+    @field_validator("queries")
+    @classmethod
+    def unique_thread_ids(cls, queries: List[QueryBase]) -> List[QueryBase]:
+        # Batch items run concurrently and must not write to the same thread
+        thread_ids = [item.thread_id for item in queries]
+        if len(set(thread_ids)) != len(thread_ids):
+            raise ValueError("Each query in a batch must use a different thread_id")
+        return queries
+
+class QueryBatchItem(BaseModel):
+    status_code: int
+    result: Optional[QueryOutput] = None
+    detail: Optional[str] = None
+
+class QueryBatchOutput(BaseModel):
+    results: List[QueryBatchItem]
\ No newline at end of file
@@ -5,13 +5,24 @@ This script tests all agent tools and API endpoints to ensure they're working co
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import io
 import sys
 import os
-from datetime import datetime
-from typing import Dict, Any, Tuple
+import time
+import threading
+from types import MappingProxyType
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Mapping, Tuple
 import importlib.util
 
+# orjson is optional; the standard library encoder is used when it is missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add current directory to Python path
 sys.path.append('.')
 
@@ -21,6 +32,37 @@ SECRET_TOKEN = "unihack25"
 TEST_ADDRESS = "addr_test1wryf65umuw5nuh8m4sjh9dka0mx7pwsmle0uyex8pf7f4ycj7y6tp"
 TEST_TX_HASH = "4bcba01d2c775b545c783bbd49a9443bb0ac071c743c86eeddd6a814852288e5"
 
+# Tool modules and the tools each one must expose
+TOOLS_TO_TEST = (
+    ("workflow.tools.blockfrost_tool", ("get_address_details", "get_transactions_for_address")),
+    ("workflow.tools.legal_data_tool", ("search_civil_law_knowledge", "search_corporate_law_knowledge")),
+    ("workflow.tools.knowledge_base_tool", ("search_cardano_knowledge",))
+)
+
+# Shared HTTP session so all tests reuse keep-alive connections to the server
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_maxsize=16, pool_block=False))
+SESSION.headers.update({"Secret-token": SECRET_TOKEN})
+
+# Per-request header variants, built once and read-only so callers can't
+# change them for later requests. requests merges any Mapping.
+_HDR_PLAIN: Mapping[str, str] = MappingProxyType({})
+_HDR_JSON: Mapping[str, str] = MappingProxyType({"Content-Type": "application/json"})
+
+# Buffered result lines are written to stdout after this many results
+FLUSH_EVERY = 10
+
+def discard_body(response: requests.Response) -> requests.Response:
+    """Drain a streamed response without buffering or decoding its body.
+
+    Only the status code is kept. Reading the body to the end (rather than
+    just closing it) hands the connection back to the session's pool.
+    """
+    with response:
+        for _ in response.raw.stream(64 * 1024, decode_content=False):
+            pass
+    return response
+
 # Test results tracking
 class TestTracker:
     def __init__(self):
@@ -28,56 +70,84 @@ class TestTracker:
         self.failed = 0
         self.total = 0
         self.results = []
+        self._lock = threading.Lock()
+        # One wall-clock reading per run; results store monotonic offsets from it
+        self.run_started_at = datetime.now()
+        self._started_ns = time.monotonic_ns()
+        # Result lines are buffered and written to stdout in batches
+        self._buf = io.StringIO()
+        self._pending = 0
 
     def add_result(self, test_name: str, passed: bool, details: str = ""):
-        self.total += 1
-        if passed:
-            self.passed += 1
-            print(f"✓ {test_name}")
-        else:
-            self.failed += 1
-            print(f"✗ {test_name}")
-            if details:
-                print(f"  Details: {details}")
-        
-        self.results.append({
-            'test': test_name,
-            'passed': passed,
-            'details': details,
-            'timestamp': datetime.now().isoformat()
-        })
+        offset_ns = time.monotonic_ns() - self._started_ns
+        with self._lock:
+            self.total += 1
+            if passed:
+                self.passed += 1
+                self._buf.write(f"✓ {test_name}\n")
+            else:
+                self.failed += 1
+                self._buf.write(f"✗ {test_name}\n")
+                if details:
+                    self._buf.write(f"  Details: {details}\n")
+            
+            self.results.append({
+                'test': test_name,
+                'passed': passed,
+                'details': details,
+                'offset_ns': offset_ns
+            })
+            self._pending += 1
+            if self._pending >= FLUSH_EVERY:
+                self._flush()
+
+    def log(self, message: str):
+        """Write a line after any buffered results, flushing them together."""
+        with self._lock:
+            self._buf.write(f"{message}\n")
+            self._flush()
+
+    def flush(self):
+        """Write out any buffered result lines."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        sys.stdout.write(self._buf.getvalue())
+        sys.stdout.flush()
+        self._buf.seek(0)
+        self._buf.truncate()
+        self._pending = 0
 
     def print_summary(self):
-        print("\n" + "="*50)
-        print("Test Summary")
-        print("="*50)
-        print(f"Total Tests: {self.total}")
-        print(f"Passed: {self.passed}")
-        print(f"Failed: {self.failed}")
+        self.log("\n" + "="*50)
+        self.log("Test Summary")
+        self.log("="*50)
+        self.log(f"Total Tests: {self.total}")
+        self.log(f"Passed: {self.passed}")
+        self.log(f"Failed: {self.failed}")
         
         if self.failed == 0:
-            print("\n🎉 All tests passed! Your AI agent system is working correctly.")
+            self.log("\n🎉 All tests passed! Your AI agent system is working correctly.")
             return True
         else:
-            print("\n⚠️  Some tests failed. Please check the issues above.")
+            self.log("\n⚠️  Some tests failed. Please check the issues above.")
             return False
 
 # Initialize test tracker
 tracker = TestTracker()
 
-def get_auth_headers(content_type: bool = False) -> Dict[str, str]:
-    """Get standard headers with authentication token."""
-    headers = {"Secret-token": SECRET_TOKEN}
-    if content_type:
-        headers["Content-Type"] = "application/json"
-    return headers
+def get_auth_headers(content_type: bool = False) -> Mapping[str, str]:
+    """Get per-request headers (the session already carries the auth token)."""
+    return _HDR_JSON if content_type else _HDR_PLAIN
 
 def check_server() -> bool:
     """Check if the FastAPI server is running."""
-    print("Checking if server is running...")
+    tracker.log("Checking if server is running...")
     try:
         headers = get_auth_headers()
-        response = requests.get(f"{API_BASE}/health", headers=headers, timeout=5)
+        response = discard_body(SESSION.get(f"{API_BASE}/health", headers=headers, 
+                                            timeout=5, stream=True))
         if response.status_code == 200:
             tracker.add_result("Server Health Check", True)
             return True
@@ -86,7 +156,7 @@ def check_server() -> bool:
             return False
     except requests.exceptions.RequestException as e:
         tracker.add_result("Server Health Check", False, f"Connection error: {str(e)}")
-        print("Please start the server with: uvicorn app.main:app --reload")
+        tracker.log("Please start the server with: uvicorn app.main:app --reload")
         return False
 
 def test_api_endpoint(endpoint: str, method: str = "GET", data: Dict = None, 
@@ -96,10 +166,11 @@ def test_api_endpoint(endpoint: str, method: str = "GET", data: Dict = None,
     
     try:
         if method == "GET":
-            response = requests.get(f"{API_BASE}{endpoint}", headers=headers, timeout=30)
+            response = discard_body(SESSION.get(f"{API_BASE}{endpoint}", headers=headers, 
+                                                timeout=30, stream=True))
         elif method == "POST":
-            response = requests.post(f"{API_BASE}{endpoint}", headers=headers, 
-                                   json=data, timeout=30)
+            response = discard_body(SESSION.post(f"{API_BASE}{endpoint}", headers=headers, 
+                                                 json=data, timeout=30, stream=True))
         
         if response.status_code == expected_status:
             tracker.add_result(test_name, True)
@@ -113,9 +184,47 @@ def test_api_endpoint(endpoint: str, method: str = "GET", data: Dict = None,
         tracker.add_result(test_name, False, f"Request error: {str(e)}")
         return False
 
+def test_api_endpoint_batch(endpoint: str, payloads: List[Dict], 
+                           expected_status: int, test_names: List[str]) -> bool:
+    """Send several queries to an endpoint's /batch route in one authenticated POST.
+
+    Each test name is recorded from the matching item of the batch response.
+    """
+    assert len(test_names) == len(payloads), "Need one test name per payload"
+    headers = get_auth_headers(content_type=True)
+    
+    try:
+        response = SESSION.post(f"{API_BASE}{endpoint}batch", headers=headers, 
+                                json={"queries": payloads}, timeout=30 * len(payloads))
+        
+        if response.status_code != expected_status:
+            details = f"Expected {expected_status}, got {response.status_code}"
+        else:
+            items = response.json().get("results", [])
+            details = "" if len(items) == len(payloads) else \
+                f"Expected {len(payloads)} results in batch response, got {len(items)}"
+            
+    except (requests.exceptions.RequestException, ValueError) as e:
+        details = f"Request error: {str(e)}"
+    
+    # The batch call itself failed, so no query has a result of its own
+    if details:
+        for test_name in test_names:
+            tracker.add_result(test_name, False, details)
+        return False
+    
+    all_passed = True
+    for test_name, item in zip(test_names, items):
+        passed = item.get("status_code") == expected_status
+        tracker.add_result(test_name, passed, 
+                           "" if passed else f"Expected {expected_status}, got "
+                                             f"{item.get('status_code')}: {item.get('detail')}")
+        all_passed = all_passed and passed
+    return all_passed
+
 def test_environment():
     """Test environment configuration."""
-    print("\nTesting Environment Configuration...")
+    tracker.log("\nTesting Environment Configuration...")
     
     try:
         from app.core.config import OPENAI_API_KEY, BLOCKFROST_PROJECT_ID
@@ -139,17 +248,11 @@ def test_environment():
 
 def test_python_tools():
     """Test Python tool imports."""
-    print("\nTesting Python Tools Import...")
+    tracker.log("\nTesting Python Tools Import...")
     
-    tools_to_test = [
-        ("workflow.tools.blockfrost_tool", ["get_address_details", "get_transactions_for_address"]),
-        ("workflow.tools.legal_data_tool", ["search_civil_law_knowledge", "search_corporate_law_knowledge"]),
-        ("workflow.tools.knowledge_base_tool", ["search_cardano_knowledge"])
-    ]
-    
-    for module_name, tool_names in tools_to_test:
+    for module_name, tool_names in TOOLS_TO_TEST:
         try:
-            module = importlib.import_module(module_name)
+            module = sys.modules.get(module_name) or importlib.import_module(module_name)
             for tool_name in tool_names:
                 if hasattr(module, tool_name):
                     tracker.add_result(f"Import {module_name}.{tool_name}", True)
@@ -161,13 +264,15 @@ def test_python_tools():
 
 def test_authentication():
     """Test authentication mechanisms."""
-    print("\nTesting Authentication...")
+    tracker.log("\nTesting Authentication...")
     
     test_data = {"thread_id": 1, "user_input": "test", "lang": "en"}
     
     # Test without token (should fail)
     try:
-        response = requests.post(f"{API_BASE}/query/", json=test_data, timeout=10)
+        # Drop the session-level token for this request
+        response = discard_body(SESSION.post(f"{API_BASE}/query/", headers={"Secret-token": None},
+                                             json=test_data, timeout=10, stream=True))
         if response.status_code == 401:
             tracker.add_result("Authentication - No Token", True)
         else:
@@ -179,8 +284,8 @@ def test_authentication():
     # Test with wrong token (should fail)
     try:
         headers = {"Secret-token": "wrongtoken", "Content-Type": "application/json"}
-        response = requests.post(f"{API_BASE}/query/", headers=headers, 
-                               json=test_data, timeout=10)
+        response = discard_body(SESSION.post(f"{API_BASE}/query/", headers=headers, 
+                                             json=test_data, timeout=10, stream=True))
         if response.status_code == 401:
             tracker.add_result("Authentication - Wrong Token", True)
         else:
@@ -192,8 +297,8 @@ def test_authentication():
     # Test with correct token (should succeed)
     try:
         headers = get_auth_headers(content_type=True)
-        response = requests.post(f"{API_BASE}/query/", headers=headers, 
-                               json=test_data, timeout=10)
+        response = discard_body(SESSION.post(f"{API_BASE}/query/", headers=headers, 
+                                             json=test_data, timeout=10, stream=True))
         if response.status_code == 201:
             tracker.add_result("Authentication - Valid Token", True)
         else:
@@ -204,72 +309,68 @@ def test_authentication():
 
 def test_cardano_agent():
     """Test Cardano agent functionality."""
-    print("\nTesting Cardano Agent...")
-    
-    # Test address balance query
-    query_data = {
-        "thread_id": 1,
-        "user_input": f"What is the balance of {TEST_ADDRESS}?",
-        "lang": "en"
-    }
-    test_api_endpoint("/query/", "POST", query_data, 201, 
-                     "Cardano Agent - Address Balance Query")
+    tracker.log("\nTesting Cardano Agent...")
     
-    # Test transaction analysis
-    tx_query_data = {
-        "thread_id": 2,
-        "user_input": f"Analyze transaction {TEST_TX_HASH}",
-        "lang": "en"
-    }
-    test_api_endpoint("/query/", "POST", tx_query_data, 201, 
-                     "Cardano Agent - Transaction Analysis")
-    
-    # Test general Cardano knowledge
-    knowledge_query_data = {
-        "thread_id": 3,
-        "user_input": "How does Cardano proof-of-stake work?",
-        "lang": "en"
-    }
-    test_api_endpoint("/query/", "POST", knowledge_query_data, 201, 
-                     "Cardano Agent - Knowledge Query")
+    test_api_endpoint_batch("/query/", [
+        # Test address balance query
+        {
+            "thread_id": 1,
+            "user_input": f"What is the balance of {TEST_ADDRESS}?",
+            "lang": "en"
+        },
+        # Test transaction analysis
+        {
+            "thread_id": 2,
+            "user_input": f"Analyze transaction {TEST_TX_HASH}",
+            "lang": "en"
+        },
+        # Test general Cardano knowledge
+        {
+            "thread_id": 3,
+            "user_input": "How does Cardano proof-of-stake work?",
+            "lang": "en"
+        },
+    ], 201, [
+        "Cardano Agent - Address Balance Query",
+        "Cardano Agent - Transaction Analysis",
+        "Cardano Agent - Knowledge Query",
+    ])
 
 def test_legal_agent():
     """Test Legal agent functionality."""
-    print("\nTesting Legal Agent...")
-    
-    # Test Civil Law query
-    civil_query_data = {
-        "thread_id": 4,
-        "domain": "civil_law",
-        "user_input": "What constitutes a valid contract?",
-        "lang": "en"
-    }
-    test_api_endpoint("/legalquery/", "POST", civil_query_data, 201, 
-                     "Legal Agent - Civil Law Query")
+    tracker.log("\nTesting Legal Agent...")
     
-    # Test Corporate Law query
-    corporate_query_data = {
-        "thread_id": 5,
-        "domain": "corporate_law",
-        "user_input": "What are the requirements for company registration?",
-        "lang": "en"
-    }
-    test_api_endpoint("/legalquery/", "POST", corporate_query_data, 201, 
-                     "Legal Agent - Corporate Law Query")
-    
-    # Test Property Law query
-    property_query_data = {
-        "thread_id": 6,
-        "domain": "property_law",
-        "user_input": "What are the steps for property transfer?",
-        "lang": "en"
-    }
-    test_api_endpoint("/legalquery/", "POST", property_query_data, 201, 
-                     "Legal Agent - Property Law Query")
+    test_api_endpoint_batch("/legalquery/", [
+        # Test Civil Law query
+        {
+            "thread_id": 4,
+            "domain": "civil_law",
+            "user_input": "What constitutes a valid contract?",
+            "lang": "en"
+        },
+        # Test Corporate Law query
+        {
+            "thread_id": 5,
+            "domain": "corporate_law",
+            "user_input": "What are the requirements for company registration?",
+            "lang": "en"
+        },
+        # Test Property Law query
+        {
+            "thread_id": 6,
+            "domain": "property_law",
+            "user_input": "What are the steps for property transfer?",
+            "lang": "en"
+        },
+    ], 201, [
+        "Legal Agent - Civil Law Query",
+        "Legal Agent - Corporate Law Query",
+        "Legal Agent - Property Law Query",
+    ])
 
 def test_vector_databases():
     """Test vector database setup."""
-    print("\nTesting Vector Database Setup...")
+    tracker.log("\nTesting Vector Database Setup...")
     
     test_api_endpoint("/training/setup_cardano_vector_db", "GET", None, 200, 
                      "Cardano Vector DB Setup")
@@ -282,16 +383,16 @@ def test_vector_databases():
 
 def test_cors():
     """Test CORS configuration."""
-    print("\nTesting CORS Configuration...")
+    tracker.log("\nTesting CORS Configuration...")
     
     try:
         headers = {
-            "Secret-token": SECRET_TOKEN,
             "Origin": "http://localhost:3000",
             "Access-Control-Request-Method": "POST",
             "Access-Control-Request-Headers": "Secret-token, Content-Type"
         }
-        response = requests.options(f"{API_BASE}/query/", headers=headers, timeout=10)
+        response = discard_body(SESSION.options(f"{API_BASE}/query/", headers=headers, 
+                                                timeout=10, stream=True))
         
         if response.status_code == 200:
             tracker.add_result("CORS Configuration", True)
@@ -310,28 +411,42 @@ def save_test_results():
             'passed': tracker.passed,
             'failed': tracker.failed
         },
-        'tests': tracker.results
+        'tests': [
+            {
+                'test': result['test'],
+                'passed': result['passed'],
+                'details': result['details'],
+                'timestamp': (tracker.run_started_at + 
+                              timedelta(microseconds=result['offset_ns'] // 1000)).isoformat()
+            }
+            for result in tracker.results
+        ]
     }
     
-    with open('test_results.json', 'w') as f:
-        json.dump(results, f, indent=2)
+    # Encode in one go and write once
+    if orjson is not None:
+        with open('test_results.json', 'wb') as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+    else:
+        with open('test_results.json', 'w') as f:
+            f.write(json.dumps(results, indent=2))
     
-    print(f"\nTest results saved to test_results.json")
+    tracker.log(f"\nTest results saved to test_results.json")
 
 def main():
     """Main test execution."""
-    print("="*50)
-    print("AI Legal & Cardano Assistant Test Suite")
-    print("="*50)
-    print(f"Test configuration:")
-    print(f"  API Base: {API_BASE}")
-    print(f"  Test Address: {TEST_ADDRESS}")
-    print(f"  Test TX Hash: {TEST_TX_HASH}")
-    print()
+    tracker.log("="*50)
+    tracker.log("AI Legal & Cardano Assistant Test Suite")
+    tracker.log("="*50)
+    tracker.log(f"Test configuration:")
+    tracker.log(f"  API Base: {API_BASE}")
+    tracker.log(f"  Test Address: {TEST_ADDRESS}")
+    tracker.log(f"  Test TX Hash: {TEST_TX_HASH}")
+    tracker.log("")
     
     # Check if server is running first
     if not check_server():
-        print("\nCannot proceed with tests - server is not running")
+        tracker.log("\nCannot proceed with tests - server is not running")
         return False
     
     # Run all tests
@@ -350,35 +465,39 @@ def main():
     return success
 
 if __name__ == "__main__":
-    # Handle command line arguments
-    if len(sys.argv) > 1:
-        test_type = sys.argv[1].lower()
+    try:
+        # Handle command line arguments
+        if len(sys.argv) > 1:
+            test_type = sys.argv[1].lower()
         
-        if not check_server() and test_type not in ['env', 'tools']:
-            print("Server not running - can only run 'env' or 'tools' tests")
-            sys.exit(1)
+            if not check_server() and test_type not in ['env', 'tools']:
+                tracker.log("Server not running - can only run 'env' or 'tools' tests")
+                sys.exit(1)
         
-        if test_type == "cardano":
-            test_cardano_agent()
-        elif test_type == "legal":
-            test_legal_agent()
-        elif test_type == "auth":
-            test_authentication()
-        elif test_type == "env":
-            test_environment()
-        elif test_type == "tools":
-            test_python_tools()
-        elif test_type == "db":
-            test_vector_databases()
-        elif test_type == "quick":
-            test_environment()
-            test_python_tools()
-        else:
-            print(f"Unknown test type: {test_type}")
-            print("Available options: cardano, legal, auth, env, tools, db, quick")
-            sys.exit(1)
+            if test_type == "cardano":
+                test_cardano_agent()
+            elif test_type == "legal":
+                test_legal_agent()
+            elif test_type == "auth":
+                test_authentication()
+            elif test_type == "env":
+                test_environment()
+            elif test_type == "tools":
+                test_python_tools()
+            elif test_type == "db":
+                test_vector_databases()
+            elif test_type == "quick":
+                test_environment()
+                test_python_tools()
+            else:
+                tracker.log(f"Unknown test type: {test_type}")
+                tracker.log("Available options: cardano, legal, auth, env, tools, db, quick")
+                sys.exit(1)
         
-        tracker.print_summary()
-    else:
-        success = main()
-        sys.exit(0 if success else 1)
+            tracker.print_summary()
+        else:
+            success = main()
+            sys.exit(0 if success else 1)
+    finally:
+        # Show buffered results before any traceback
+        tracker.flush()
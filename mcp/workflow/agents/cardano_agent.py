@@ -10,6 +10,7 @@ from workflow.tools.knowledge_base_tool import search_cardano_knowledge, get_car
 from app.core.config import MODELS, TEMPERATURE, OPENAI_API_KEY
 
 import logging
+import threading
 logger = logging.getLogger(__name__)
 
 class AgentState(TypedDict):
@@ -51,28 +52,28 @@ class CardanoAgent:
         - Only use tools when necessary
         """
 
+        # Threads already known to have checkpointed history
+        self._known_threads: set[int] = set()
+
         self.graph = self._build_graph()
 
     def _build_graph(self) -> StateGraph:
+        llm_with_tools = self.llm_with_tools
+        tool_node = self.tool_node
+
         def should_continue(state: AgentState) -> Literal["tools", "end"]:
             last_message = state["messages"][-1]
-            if hasattr(last_message, 'tool_calls') and last_message.tool_calls:
-                return "tools"
-            return "end"
+            tool_calls = getattr(last_message, 'tool_calls', None)
+            return "tools" if tool_calls else "end"
 
         def call_model(state: AgentState) -> AgentState:
             messages = state["messages"]
-            response = self.llm_with_tools.invoke(messages)
+            response = llm_with_tools.invoke(messages)
             return {"messages": [response]}
 
-        def call_tools(state: AgentState) -> AgentState:
-            last_message = state["messages"][-1]
-            tool_results = self.tool_node.invoke({"messages": [last_message]})
-            return {"messages": state["messages"] + tool_results["messages"]}
-
         workflow = StateGraph(AgentState)
         workflow.add_node("agent", call_model)
-        workflow.add_node("tools", self.tool_node)
+        workflow.add_node("tools", tool_node)
         workflow.add_edge(START, "agent")
         workflow.add_conditional_edges(
             "agent",
@@ -93,14 +94,19 @@ class CardanoAgent:
         Checks if this is a new thread by querying the graph's state.
         Returns True if there is no history for this thread_id.
         """
+        if thread_id in self._known_threads:
+            return False
         config = {"configurable": {"thread_id": str(thread_id)}}
         state = self.graph.get_state(config=config)
         if state.values == {}:
             return True
         else:
+            self._known_threads.add(thread_id)
             return False
 
 def chat(graph: StateGraph, thread_id: int, user_input: str) -> str:
+    # Built outside the try so configuration errors are raised, not answered
+    agent = _get_agent()
     try:
          # Detect if this is a new thread by checking existing state
         is_new = agent.is_new_thread(thread_id)
@@ -118,8 +124,9 @@ def chat(graph: StateGraph, thread_id: int, user_input: str) -> str:
             "context": "",
             "response": ""
         }
-        config = {"configurable": {"thread_id": thread_id}}
+        config = {"configurable": {"thread_id": str(thread_id)}}
         result = graph.invoke(initial_state, config)
+        agent._known_threads.add(thread_id)
         final_message = result["messages"][-1]
         if hasattr(final_message, 'content'):
             return final_message.content
@@ -128,20 +135,35 @@ def chat(graph: StateGraph, thread_id: int, user_input: str) -> str:
     except Exception as e:
         return f"I encountered an error while processing your request: {str(e)}"
 
-# Initialize agent and graph once for reuse
-agent = CardanoAgent()
-graph = agent.graph
+# Agent and graph are built on first use and then reused
+_agent = None
+_agent_lock = threading.Lock()
+
+def _get_agent() -> CardanoAgent:
+    global _agent
+    if _agent is None:
+        # Batch queries can race on the first request
+        with _agent_lock:
+            if _agent is None:
+                _agent = CardanoAgent()
+    return _agent
+
+def __getattr__(name: str):
+    # Keep `agent` and `graph` importable as module attributes (PEP 562)
+    if name in {"agent", "graph"}:
+        agent = _get_agent()
+        return agent if name == "agent" else agent.graph
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 class CardanoChatbot:
     def __init__(self, thread_id: int = 0):
         self.thread_id = thread_id
 
     def chat(self, user_input: str) -> str:
-        return chat(graph, self.thread_id, user_input)
+        return chat(_get_agent().graph, self.thread_id, user_input)
 
 def kickoff_cardanoAgent(thread_id: int, user_input: str):
-    chatbot = CardanoChatbot(thread_id=thread_id)
-    response = chatbot.chat(user_input)
+    response = chat(_get_agent().graph, thread_id, user_input)
     return response
 
 if __name__ == "__main__":
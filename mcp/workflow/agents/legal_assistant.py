@@ -50,25 +50,22 @@ class LawyerAgent:
         self.graph = self._build_graph()
 
     def _build_graph(self) -> StateGraph:
+        llm_with_tools = self.llm_with_tools
+        tool_node = self.tool_node
+
         def should_continue(state: AgentState) -> Literal["tools", "end"]:
             last_message = state["messages"][-1]
-            if hasattr(last_message, 'tool_calls') and last_message.tool_calls:
-                return "tools"
-            return "end"
+            tool_calls = getattr(last_message, 'tool_calls', None)
+            return "tools" if tool_calls else "end"
 
         def call_model(state: AgentState) -> AgentState:
             messages = state["messages"]
-            response = self.llm_with_tools.invoke(messages)
+            response = llm_with_tools.invoke(messages)
             return {"messages": [response]}
 
-        def call_tools(state: AgentState) -> AgentState:
-            last_message = state["messages"][-1]
-            tool_results = self.tool_node.invoke({"messages": [last_message]})
-            return {"messages": state["messages"] + tool_results["messages"]}
-
         workflow = StateGraph(AgentState)
         workflow.add_node("agent", call_model)
-        workflow.add_node("tools", self.tool_node)
+        workflow.add_node("tools", tool_node)
         workflow.add_edge(START, "agent")
         workflow.add_conditional_edges(
             "agent",